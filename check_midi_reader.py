@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Check that the fast MIDI note reader matches muspy.read_midi.
+
+Every given MIDI file, plus a few generated edge cases, is read with both
+readers and the file info, tracks and notes are compared.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+import mido
+
+from humanizer.fast_io import read_notes_fast
+from midi_analyzer import read_notes_muspy
+
+
+def write_edge_cases(output_dir):
+    """Write MIDI files covering the reader's edge cases, returning their paths"""
+    cases = {
+        # Notes on a channel followed by a program change
+        "program_change_after_notes": [
+            mido.Message("note_on", channel=0, note=60, velocity=64),
+            mido.Message("note_off", channel=0, note=60, time=96),
+            mido.Message("program_change", channel=0, program=5),
+        ],
+        # A note off without a matching note on
+        "stray_note_off": [
+            mido.Message("note_on", channel=0, note=60, velocity=64),
+            mido.Message("note_off", channel=0, note=60, time=96),
+            mido.Message("note_off", channel=3, note=62, time=10),
+        ],
+        # Duplicate notes, running status and notes left sounding
+        "duplicate_and_open_notes": [
+            mido.Message("note_on", channel=0, note=60, velocity=64),
+            mido.Message("note_on", channel=0, note=60, velocity=80, time=10),
+            mido.Message("note_on", channel=0, note=60, velocity=0, time=10),
+            mido.Message("control_change", channel=2, control=7, value=100),
+            mido.Message("note_on", channel=9, note=36, velocity=100, time=20),
+            mido.Message("pitchwheel", channel=1, pitch=100),
+        ],
+    }
+
+    paths = []
+    for name, messages in cases.items():
+        midi = mido.MidiFile(type=1, ticks_per_beat=96)
+        midi.tracks.append(mido.MidiTrack([mido.MetaMessage("set_tempo")]))
+        midi.tracks.append(
+            mido.MidiTrack([mido.MetaMessage("track_name", name=name), *messages])
+        )
+        path = os.path.join(output_dir, f"{name}.mid")
+        midi.save(path)
+        paths.append(path)
+    return paths
+
+
+def compare_readers(file_path):
+    """Return a description of the first difference between the readers, or None"""
+    expected = read_notes_muspy(file_path)
+    actual = read_notes_fast(file_path)
+
+    if actual[0] != expected[0]:
+        return f"info differs: {actual[0]} != {expected[0]}"
+    if len(actual[1]) != len(expected[1]):
+        return f"track count differs: {len(actual[1])} != {len(expected[1])}"
+    for i, (track, expected_track) in enumerate(zip(actual[1], expected[1])):
+        if track != expected_track:
+            return f"track {i} differs: {track} != {expected_track}"
+    for field, values, expected_values in zip(
+        ("starts", "ends", "velocities", "pitches"), actual[2:], expected[2:]
+    ):
+        if values.tolist() != expected_values.tolist():
+            return f"{field} differ"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check that the fast MIDI note reader matches muspy"
+    )
+    parser.add_argument("midi_files", nargs="*", help="MIDI files to compare")
+    args = parser.parse_args()
+
+    mismatches = 0
+    with tempfile.TemporaryDirectory() as temp_dir:
+        files = write_edge_cases(temp_dir) + args.midi_files
+        for file_path in files:
+            difference = compare_readers(file_path)
+            if difference:
+                mismatches += 1
+                print(f"MISMATCH {os.path.basename(file_path)}: {difference}")
+
+    print(f"Checked {len(files)} files, {mismatches} mismatched")
+    return 0 if mismatches == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
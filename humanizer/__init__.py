@@ -5,13 +5,39 @@ This package provides various methods for making MIDI files sound more natural
 and human-like through different humanization techniques.
 """
 
-from .basic import humanize_midi_basic
-from .piano_performance import humanize_midi_advanced
-from .presets import HUMANIZATION_METHODS, get_preset_settings
+from importlib import import_module
+
+from .presets import (
+    HUMANIZATION_METHODS,
+    PresetSettings,
+    PresetTicks,
+    get_preset_settings,
+)
 
 __all__ = [
     "humanize_midi_basic",
     "humanize_midi_advanced",
     "HUMANIZATION_METHODS",
     "get_preset_settings",
+    "PresetSettings",
+    "PresetTicks",
+    "seed_humanizer",
+    "make_rng",
 ]
+
+# The humanizers load numba, so import them on first use. Tools that only need
+# a light module such as fast_io then don't pay for it.
+_LAZY_IMPORTS = {
+    "humanize_midi_basic": ".basic",
+    "humanize_midi_advanced": ".piano_performance",
+    "seed_humanizer": ".core",
+    "make_rng": ".core",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
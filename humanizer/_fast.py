@@ -0,0 +1,126 @@
+"""
+Optional Numba-compiled kernels for MIDI humanization.
+
+Numba is not a hard dependency. When it is missing, HAVE_NUMBA is False and
+the kernels below stay plain Python functions; callers should prefer their
+NumPy code paths in that case.
+"""
+
+try:
+    from numba import njit
+
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the function uncompiled."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def resolve_overlaps(starts, ends, order, run_starts, min_duration_ticks):
+    """
+    Shorten overlapping notes in place by rewriting ends.
+
+    order sorts the notes by run then start time, and run_starts holds the
+    boundaries of each run (same track and pitch) within order, ending with
+    len(order). Returns the number of overlaps resolved.
+    """
+    count = 0
+    for r in range(len(run_starts) - 1):
+        for i in range(run_starts[r], run_starts[r + 1] - 1):
+            current = order[i]
+            following = order[i + 1]
+            if ends[current] > starts[following]:
+                count += 1
+                ends[current] = max(
+                    starts[current] + min_duration_ticks, starts[following] - 1
+                )
+    return count
+
+
+@njit(cache=True)
+def humanize_notes(
+    starts,
+    ends,
+    velocities,
+    velocity_offsets,
+    start_offsets,
+    end_offsets,
+    min_duration_ticks,
+):
+    """
+    Apply velocity and timing offsets to every note in a single pass, in place.
+
+    Moving a start carries the end along, velocities are clamped to 1-127
+    and every note keeps at least min_duration_ticks.
+    """
+    for i in range(len(starts)):
+        velocity = velocities[i] + velocity_offsets[i]
+        velocities[i] = min(127, max(1, velocity))
+
+        start = max(0, starts[i] + start_offsets[i])
+        end = ends[i] + (start - starts[i]) + end_offsets[i]
+        starts[i] = start
+        ends[i] = max(end, start + min_duration_ticks)
+
+
+@njit(cache=True)
+def shift_notes(starts, ends, start_offsets, end_offsets, min_duration_ticks):
+    """
+    Apply note-on and note-off offsets to every note in a single pass, in place.
+
+    Moving a start carries the end along and every note keeps at least
+    min_duration_ticks.
+    """
+    for i in range(len(starts)):
+        start = max(0, starts[i] + start_offsets[i])
+        end = ends[i] + (start - starts[i]) + end_offsets[i]
+        starts[i] = start
+        ends[i] = max(end, start + min_duration_ticks)
+
+
+@njit(cache=True)
+def mark_timing_groups(sorted_starts, timing_tolerance_ticks, new_group):
+    """
+    Flag in new_group the notes that open a timing group, in place.
+
+    sorted_starts must be in ascending order. Each group is anchored at its
+    first note and collects the notes starting within tolerance of it.
+    """
+    group_limit = 0
+    for i in range(len(sorted_starts)):
+        if i == 0 or sorted_starts[i] > group_limit:
+            new_group[i] = True
+            group_limit = sorted_starts[i] + timing_tolerance_ticks
+
+
+@njit(cache=True)
+def accent_velocities(
+    velocities,
+    individual_offsets,
+    note_strengths,
+    group_ids,
+    group_sizes,
+    group_offsets,
+    variations,
+    correlate_chords,
+):
+    """
+    Apply beat-aware velocity offsets in place, clamped to 1-127.
+
+    With correlate_chords, notes in multi-note groups take their group's offset
+    plus a small variation. Every other note takes its individual offset scaled
+    by its beat strength.
+    """
+    for i in range(len(velocities)):
+        group = group_ids[i]
+        if correlate_chords and group_sizes[group] > 1:
+            offset = group_offsets[group] + variations[i]
+        else:
+            offset = int(individual_offsets[i] * note_strengths[i])
+        velocity = velocities[i] + offset
+        velocities[i] = min(127, max(1, velocity))
@@ -5,12 +5,77 @@ This module provides simple velocity and timing randomization
 for MIDI files without advanced musical analysis.
 """
 
-import random
-from .presets import get_preset_settings
-from .core import resolve_overlapping_notes
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+from .presets import PresetTicks, get_preset_settings
+from .core import _rng, NoteArrays, make_rng, random_offsets
+from ._fast import HAVE_NUMBA, humanize_notes
+
+
+def _humanize_track(
+    track,
+    velocity_range,
+    noteon_timing_ticks,
+    noteoff_timing_ticks,
+    min_duration_ticks,
+    seed,
+):
+    """
+    Randomize velocity and timing of every note in a track.
+
+    Tracks are independent, so this runs unchanged in a worker process.
+    Returns (track, large_velocity_changes, large_timing_changes, overlap_count).
+    """
+    rng = make_rng(seed)
+    note_count = len(track.notes)
+
+    arrays = NoteArrays.from_notes(track.notes)
+
+    # Draw all random offsets for the track at once. Ranges can be zero, e.g.
+    # sub-tick note-off ranges at low resolutions, and then draw nothing.
+    velocity_offsets = random_offsets(rng, velocity_range, note_count, np.int32)
+    start_offsets = random_offsets(rng, noteon_timing_ticks, note_count, np.int32)
+    end_offsets = random_offsets(rng, noteoff_timing_ticks, note_count, np.int32)
+
+    if HAVE_NUMBA:
+        # Apply all offsets in a single compiled pass over the arrays
+        humanize_notes(
+            arrays.starts,
+            arrays.ends,
+            arrays.velocities,
+            velocity_offsets,
+            start_offsets,
+            end_offsets,
+            min_duration_ticks,
+        )
+    else:
+        # Randomize velocity (clamp to MIDI range)
+        velocities = arrays.velocities
+        if velocity_range:
+            velocities += velocity_offsets
+        np.clip(velocities, 1, 127, out=velocities)
+
+        # Randomize note-on/off timing and ensure minimum duration
+        arrays.shift(start_offsets, end_offsets, min_duration_ticks)
+
+    # Overlaps only occur within a track, so resolve them before writing back
+    overlap_count = arrays.shorten_overlaps(min_duration_ticks)
+
+    arrays.sync_back()
+
+    # Count significant changes instead of printing each one
+    large_velocity_changes = int(
+        np.count_nonzero(np.abs(velocity_offsets) > velocity_range // 2)
+    )
+    large_timing_changes = int(
+        np.count_nonzero(np.abs(start_offsets) > noteon_timing_ticks // 2)
+    )
+    return track, large_velocity_changes, large_timing_changes, overlap_count
 
 
-def humanize_midi_basic(music, method="basic", preset_name="medium"):
+def humanize_midi_basic(music, method="basic", preset_name="medium", workers=1):
     """
     Original basic MIDI humanization with simple randomization.
 
@@ -18,16 +83,19 @@ def humanize_midi_basic(music, method="basic", preset_name="medium"):
         music: The muspy.Music object to humanize
         method: The humanization method (should be "basic")
         preset_name: The preset intensity to apply
+        workers: Number of processes to humanize tracks in. Pickling tracks
+            costs more than humanizing them, so only raise this for files
+            with many large tracks.
 
     Returns:
         The humanized muspy.Music object
     """
     settings = get_preset_settings(method, preset_name)
 
-    velocity_range = settings["velocity_range"]
-    noteon_timing_range = settings["noteon_timing_range"]
-    noteoff_timing_range = settings["noteoff_timing_range"]
-    min_duration_beats = settings["min_duration_beats"]
+    velocity_range = settings.velocity_range
+    noteon_timing_range = settings.noteon_timing_range
+    noteoff_timing_range = settings.noteoff_timing_range
+    min_duration_beats = settings.min_duration_beats
 
     print(f"Applying {method} humanization with {preset_name} intensity:")
     print(f"  Velocity range: ±{velocity_range}")
@@ -35,56 +103,47 @@ def humanize_midi_basic(music, method="basic", preset_name="medium"):
     print(f"  Note-off timing range: ±{noteoff_timing_range:.3f} beats")
     print(f"  Minimum note duration: {min_duration_beats} beats")
 
-    # Get the resolution for timing calculations
-    resolution = music.resolution
-
     # Convert beat-based timing ranges to tick-based
-    noteon_timing_ticks = int(noteon_timing_range * resolution)
-    noteoff_timing_ticks = int(noteoff_timing_range * resolution)
-    min_duration_ticks = int(min_duration_beats * resolution)
+    ticks = PresetTicks.from_settings(settings, music.resolution)
 
     print(
-        f"  Timing in ticks (resolution={resolution}): note-on ±{noteon_timing_ticks}, note-off ±{noteoff_timing_ticks}"
+        f"  Timing in ticks (resolution={ticks.resolution}): note-on ±{ticks.noteon_timing}, note-off ±{ticks.noteoff_timing}"
     )
 
-    for track in music.tracks:
+    # Give every track its own random stream, derived from the shared generator
+    seeds = _rng.integers(2**63, size=len(music.tracks)).tolist()
+    track_args = (
+        music.tracks,
+        repeat(velocity_range),
+        repeat(ticks.noteon_timing),
+        repeat(ticks.noteoff_timing),
+        repeat(ticks.min_duration),
+        seeds,
+    )
+
+    if workers > 1 and len(music.tracks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_humanize_track, *track_args))
+        # Workers return humanized copies of the tracks
+        music.tracks = [track for track, _, _, _ in results]
+    else:
+        results = list(map(_humanize_track, *track_args))
+
+    large_velocity_changes = 0
+    large_timing_changes = 0
+    overlap_count = 0
+    for track, velocity_changes, timing_changes, track_overlaps in results:
         print(f"\nProcessing track: {track.name}")
-        original_count = len(track.notes)
-
-        for note in track.notes:
-            original_start = note.start
-            original_end = note.end
-            original_velocity = note.velocity
-
-            # Randomize velocity (clamp to MIDI range)
-            velocity_offset = random.randint(-velocity_range, velocity_range)
-            note.velocity = max(1, min(127, note.velocity + velocity_offset))
-
-            # Randomize note-on timing
-            start_offset = random.randint(-noteon_timing_ticks, noteon_timing_ticks)
-            note.start = max(0, note.start + start_offset)
-
-            # Randomize note-off timing
-            end_offset = random.randint(-noteoff_timing_ticks, noteoff_timing_ticks)
-            note.end = note.end + end_offset
-
-            # Ensure minimum duration
-            if note.end - note.start < min_duration_ticks:
-                note.end = note.start + min_duration_ticks
-
-            # Debug output for significant changes
-            if (
-                abs(velocity_offset) > velocity_range // 2
-                or abs(start_offset) > noteon_timing_ticks // 2
-            ):
-                print(
-                    f"    Note {note.pitch}: velocity {original_velocity}→{note.velocity}, "
-                    f"timing {original_start}→{note.start}, duration {original_end-original_start}→{note.end-note.start}"
-                )
-
-        print(f"  Processed {original_count} notes")
-
-    # Resolve overlapping notes
-    resolve_overlapping_notes(music, min_duration_ticks)
+        print(f"  Processed {len(track.notes)} notes")
+        large_velocity_changes += velocity_changes
+        large_timing_changes += timing_changes
+        overlap_count += track_overlaps
+
+    print(
+        f"\nSignificant changes: {large_velocity_changes} velocity, {large_timing_changes} timing"
+    )
+
+    # Overlapping notes were resolved per track above
+    print(f"Resolved {overlap_count} overlapping notes")
 
     return music
@@ -5,115 +5,231 @@ This module contains common functions used by different humanization methods,
 including chord detection, timing utilities, and musical analysis functions.
 """
 
-import random
-from collections import defaultdict
+from dataclasses import dataclass
 
+import numpy as np
 
-def detect_chords(notes, tolerance_ticks=10):
+from ._fast import HAVE_NUMBA, mark_timing_groups, resolve_overlaps, shift_notes
+
+
+def make_rng(seed=None):
     """
-    Detect simultaneous notes (chords) within a timing tolerance.
-    Returns a list of chord groups.
+    Create a PCG64DXSM random generator, seeded for reproducible runs
+    or from fresh OS entropy when seed is None.
     """
-    # Group notes by start time (with tolerance)
-    note_groups = defaultdict(list)
-
-    for note in notes:
-        # Find if this note belongs to an existing group
-        found_group = False
-        for start_time in note_groups.keys():
-            if abs(note.start - start_time) <= tolerance_ticks:
-                note_groups[start_time].append(note)
-                found_group = True
-                break
+    return np.random.Generator(np.random.PCG64DXSM(seed))
 
-        if not found_group:
-            note_groups[note.start].append(note)
 
-    # Return only groups with 3+ notes (actual chords)
-    chords = [group for group in note_groups.values() if len(group) >= 3]
-    return chords
+# Shared random generator for every humanization pass (see seed_humanizer)
+_rng = make_rng()
 
 
-def separate_hands_by_pitch(notes, split_point=60):
+def seed_humanizer(seed=None):
     """
-    Separate notes into left and right hand based on pitch.
-    Default split at middle C (MIDI note 60).
+    Seed the shared random generator so humanization runs are reproducible.
+    Pass None to reseed from fresh OS entropy.
     """
-    left_hand = []
-    right_hand = []
+    # Reset the state in place so modules holding a reference see the new seed
+    _rng.bit_generator.state = np.random.PCG64DXSM(seed).state
 
-    for note in notes:
-        if note.pitch < split_point:
-            left_hand.append(note)
-        else:
-            right_hand.append(note)
 
-    return left_hand, right_hand
-
-
-def detect_phrase_endings(notes, min_duration_ticks=480):
+def random_offsets(rng, offset_range, size, dtype=np.int64):
     """
-    Simple phrase ending detection based on note duration.
-    Notes longer than min_duration_ticks are likely phrase endings.
+    Draw size uniform integer offsets in [-offset_range, offset_range].
+    A zero range returns zeros without calling the generator.
     """
-    phrase_endings = []
-    for note in notes:
-        duration = note.end - note.start
-        if duration >= min_duration_ticks:
-            phrase_endings.append(note)
-    return phrase_endings
+    if offset_range == 0:
+        return np.zeros(size, dtype=dtype)
+    return rng.integers(-offset_range, offset_range + 1, size=size, dtype=dtype)
 
 
-def group_notes_by_timing(notes, timing_tolerance_ticks=10):
+def notes_to_soa(notes):
     """
-    Group notes that occur at roughly the same time (for velocity correlation).
-    Returns dict of {timing: [notes]} where timing is representative start time.
+    Convert a list of notes into a Structure-of-Arrays layout.
+    Returns (starts, ends, velocities, pitches) as int32 numpy arrays.
     """
-    groups = defaultdict(list)
+    count = len(notes)
+    starts = np.fromiter((note.start for note in notes), np.int32, count=count)
+    ends = np.fromiter((note.end for note in notes), np.int32, count=count)
+    velocities = np.fromiter((note.velocity for note in notes), np.int32, count=count)
+    pitches = np.fromiter((note.pitch for note in notes), np.int32, count=count)
+    return starts, ends, velocities, pitches
 
-    for note in notes:
-        # Find existing group within tolerance
-        found_group = False
-        for group_time in groups.keys():
-            if abs(note.start - group_time) <= timing_tolerance_ticks:
-                groups[group_time].append(note)
-                found_group = True
-                break
 
-        if not found_group:
-            groups[note.start].append(note)
+@dataclass
+class NoteArrays:
+    """
+    Structure-of-Arrays view of a list of notes.
 
-    return groups
+    Humanization passes read and write the arrays directly, and sync_back
+    copies the results onto the original note objects once at the end.
+    """
 
+    starts: np.ndarray
+    ends: np.ndarray
+    velocities: np.ndarray
+    pitches: np.ndarray
+    notes: list
+
+    @classmethod
+    def from_notes(cls, notes):
+        """Build the arrays from a list of notes."""
+        return cls(*notes_to_soa(notes), notes)
+
+    def __len__(self):
+        return len(self.notes)
+
+    def move_starts(self, indices, new_starts):
+        """
+        Move notes to new start times, carrying their ends along
+        the same way setting note.start does.
+        """
+        self.ends[indices] += new_starts - self.starts[indices]
+        self.starts[indices] = new_starts
+
+    def shift(self, start_offsets, end_offsets, min_duration_ticks):
+        """
+        Apply note-on and note-off offsets to every note in one fused update.
+        Ends move with their starts and every note keeps min_duration_ticks.
+        """
+        if HAVE_NUMBA:
+            shift_notes(
+                self.starts, self.ends, start_offsets, end_offsets, min_duration_ticks
+            )
+        else:
+            new_starts = np.maximum(0, self.starts + start_offsets)
+            self.ends += new_starts - self.starts + end_offsets
+            self.starts[:] = new_starts
+            np.maximum(self.ends, self.starts + min_duration_ticks, out=self.ends)
+
+    def shorten_overlaps(self, min_duration_ticks):
+        """
+        Shorten each note that overlaps the next note of the same pitch.
+        Returns the number of overlaps resolved.
+        """
+        # Sort notes by pitch, then start time, so each note is followed by
+        # the next note of the same pitch
+        order = np.lexsort((self.starts, self.pitches))
+        sorted_pitches = self.pitches[order]
+        same_pitch = sorted_pitches[:-1] == sorted_pitches[1:]
+
+        if HAVE_NUMBA:
+            run_starts = np.concatenate(
+                ([0], np.flatnonzero(~same_pitch) + 1, [len(order)])
+            )
+            return resolve_overlaps(
+                self.starts, self.ends, order, run_starts, min_duration_ticks
+            )
+
+        sorted_starts = self.starts[order]
+        overlaps = same_pitch & (self.ends[order[:-1]] > sorted_starts[1:])
+
+        # Shorten current note to end just before next note starts
+        new_ends = np.maximum(
+            sorted_starts[:-1] + min_duration_ticks, sorted_starts[1:] - 1
+        )
+        self.ends[order[:-1][overlaps]] = new_ends[overlaps]
+        return int(np.count_nonzero(overlaps))
+
+    def sync_back(self):
+        """Write the array values back onto the original note objects."""
+        for note, start, end, velocity in zip(
+            self.notes,
+            self.starts.tolist(),
+            self.ends.tolist(),
+            self.velocities.tolist(),
+        ):
+            note.start = start
+            note.end = end
+            note.velocity = velocity
+
+
+def detect_chords(arrays, tolerance_ticks=10):
+    """
+    Detect simultaneous notes (chords) within a timing tolerance.
 
-def resolve_overlapping_notes(music, min_duration_ticks):
+    Returns (chord_offsets, note_order) in CSR layout: chord c holds the notes
+    note_order[chord_offsets[c]:chord_offsets[c + 1]], in start order.
     """
-    Resolve overlapping notes by shortening earlier notes.
-    This is a common utility used by all humanization methods.
+    order = np.argsort(arrays.starts, kind="stable")
+    if len(order) == 0:
+        return np.zeros(1, dtype=np.intp), order
+    sorted_starts = arrays.starts[order]
+
+    # Gaps wider than the tolerance always separate groups
+    breaks = np.flatnonzero(np.diff(sorted_starts) > tolerance_ticks) + 1
+    bounds = np.concatenate(([0], breaks, [len(order)]))
+
+    # A run of close notes spanning more than the tolerance holds several groups
+    # anchored at their earliest note, so only those runs need the full sweep
+    spans = sorted_starts[bounds[1:] - 1] - sorted_starts[bounds[:-1]]
+    for run in np.flatnonzero(spans > tolerance_ticks).tolist():
+        lo, hi = bounds[run], bounds[run + 1]
+        group_ids, _ = timing_group_ids(sorted_starts[lo:hi], tolerance_ticks)
+        breaks = np.append(breaks, lo + np.flatnonzero(np.diff(group_ids)) + 1)
+    if len(breaks) > len(bounds) - 2:
+        bounds = np.concatenate(([0], np.sort(breaks), [len(order)]))
+
+    # Keep only groups with 3+ notes (actual chords)
+    sizes = np.diff(bounds)
+    is_chord = sizes >= 3
+    chord_offsets = np.zeros(np.count_nonzero(is_chord) + 1, dtype=np.intp)
+    np.cumsum(sizes[is_chord], out=chord_offsets[1:])
+    return chord_offsets, order[np.repeat(is_chord, sizes)]
+
+
+def separate_hands_by_pitch(arrays, split_point=60):
+    """
+    Separate notes into left and right hand based on pitch.
+    Default split at middle C (MIDI note 60).
+    Returns (left_hand, right_hand) index arrays into the NoteArrays.
     """
-    print("Resolving note overlaps...")
-    overlap_count = 0
+    left_hand = arrays.pitches < split_point
+    return np.flatnonzero(left_hand), np.flatnonzero(~left_hand)
 
-    for track in music.tracks:
-        # Sort notes by pitch, then by start time
-        notes_by_pitch = defaultdict(list)
-        for note in track.notes:
-            notes_by_pitch[note.pitch].append(note)
 
-        for pitch, notes in notes_by_pitch.items():
-            notes.sort(key=lambda n: n.start)
+def phrase_ending_indices(starts, ends, min_duration_ticks=480):
+    """
+    Simple phrase ending detection based on note duration.
+    Returns the indices of notes lasting at least min_duration_ticks,
+    which are likely phrase endings.
+    """
+    return np.flatnonzero(ends - starts >= min_duration_ticks)
 
-            for i in range(len(notes) - 1):
-                current_note = notes[i]
-                next_note = notes[i + 1]
 
-                # If current note overlaps with next note
-                if current_note.end > next_note.start:
-                    overlap_count += 1
-                    # Shorten current note to end just before next note starts
-                    current_note.end = max(
-                        current_note.start + min_duration_ticks, next_note.start - 1
-                    )
+def timing_group_ids(starts, timing_tolerance_ticks=10):
+    """
+    Group notes that occur at roughly the same time (for velocity correlation).
 
-    print(f"Resolved {overlap_count} overlapping notes")
-    return overlap_count
+    Returns (group_ids, group_count), where group_ids[k] is the group of the
+    note starting at starts[k] and groups are numbered in start order. Each group
+    is anchored at its earliest note and collects the notes starting within
+    tolerance of it.
+    """
+    # Notes usually arrive in start order, so skip the sort when they already are.
+    # Otherwise the stable sort is a timsort, which merges the existing runs cheaply.
+    in_order = bool(np.all(starts[:-1] <= starts[1:]))
+    if in_order:
+        sorted_starts = starts
+    else:
+        order = np.argsort(starts, kind="stable")
+        sorted_starts = starts[order]
+
+    # Sweep notes in start order, opening a new group once past the anchor's limit
+    new_group = np.zeros(len(starts), dtype=bool)
+    if HAVE_NUMBA:
+        mark_timing_groups(sorted_starts, timing_tolerance_ticks, new_group)
+    else:
+        group_limit = float("-inf")
+        for position, start in enumerate(sorted_starts.tolist()):
+            if start > group_limit:
+                new_group[position] = True
+                group_limit = start + timing_tolerance_ticks
+
+    sorted_ids = (np.cumsum(new_group) - 1).astype(np.int32)
+    if in_order:
+        group_ids = sorted_ids
+    else:
+        group_ids = np.empty(len(starts), dtype=np.int32)
+        group_ids[order] = sorted_ids
+    return group_ids, int(np.count_nonzero(new_group))
@@ -0,0 +1,230 @@
+"""
+Lightweight MIDI note reader.
+
+muspy.read_midi parses the file with mido, which builds a Message object for
+every event, and then builds a Music object with a Python object for every
+note. Tools that only need the notes can read them straight from the file's
+bytes into int32 arrays here instead.
+"""
+
+from collections import defaultdict
+
+import numpy as np
+
+# Parsing mirrors muspy.inputs.midi (read_midi's mido backend), which is the
+# reference behaviour: keep the two in step when fixing either
+
+# Number of data bytes following each channel message status (by high nibble)
+_CHANNEL_DATA_LENGTHS = {
+    0x80: 2,
+    0x90: 2,
+    0xA0: 2,
+    0xB0: 2,
+    0xC0: 1,
+    0xD0: 1,
+    0xE0: 2,
+}
+
+# Number of data bytes following each system common and real-time status
+_SYSTEM_DATA_LENGTHS = {
+    0xF1: 1,
+    0xF2: 2,
+    0xF3: 1,
+    0xF6: 0,
+    0xF8: 0,
+    0xFA: 0,
+    0xFB: 0,
+    0xFC: 0,
+    0xFE: 0,
+}
+
+# Meta event types counted in the file info
+_META_COUNTS = {0x51: "tempos", 0x58: "time_signatures", 0x59: "key_signatures"}
+
+
+def _read_variable_int(data, position):
+    """Read a variable-length quantity, returning (value, next position)."""
+    value = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value = (value << 7) | (byte & 0x7F)
+        if byte < 0x80:
+            return value, position
+
+
+def read_notes_fast(path):
+    """
+    Read the notes of a MIDI file into arrays without building muspy objects.
+
+    Returns (info, tracks, starts, ends, velocities, pitches). info holds the
+    resolution and the number of tempo, key signature and time signature
+    events. Each entry of tracks holds a track's name, program, is_drum flag
+    and the slice of the arrays with its notes. The arrays follow the
+    notes_to_soa order, as if built from the notes of every track in turn.
+
+    Notes are paired, split into tracks and sorted the same way
+    muspy.read_midi does (FIFO for duplicate notes, one track per MIDI track,
+    program and channel).
+    """
+    with open(path, "rb") as midi_file:
+        data = midi_file.read()
+
+    if data[:4] != b"MThd":
+        raise ValueError("MThd not found. Probably not a MIDI file")
+    header_size = int.from_bytes(data[4:8], "big")
+    midi_type = int.from_bytes(data[8:10], "big")
+    track_count = int.from_bytes(data[10:12], "big")
+    resolution = int.from_bytes(data[12:14], "big", signed=True)
+    if midi_type == 2:
+        raise ValueError("Type 2 MIDI file is not supported.")
+    if resolution < 1:
+        raise ValueError("`ticks_per_beat` must be positive.")
+
+    info = {
+        "resolution": resolution,
+        "tempos": 0,
+        "key_signatures": 0,
+        "time_signatures": 0,
+    }
+    tracks = []
+    # Notes of every track as (starts, ends, velocities, pitches) lists
+    track_notes = []
+
+    position = 8 + header_size
+    for track_idx in range(track_count):
+        if data[position : position + 4] != b"MTrk":
+            raise ValueError("no MTrk header at start of track")
+        chunk_end = (
+            position + 8 + int.from_bytes(data[position + 4 : position + 8], "big")
+        )
+        position += 8
+
+        time = 0
+        name = None
+        running_status = None
+        channel_programs = [0] * 16
+        active_notes = defaultdict(list)
+        # Like muspy, a MIDI track gets one track per (program, channel) in use
+        sub_tracks = {}
+
+        def get_notes(channel):
+            key = (channel_programs[channel], channel)
+            if key not in sub_tracks:
+                sub_tracks[key] = ([], [], [], [])
+            return sub_tracks[key]
+
+        while position < chunk_end:
+            delta, position = _read_variable_int(data, position)
+            time += delta
+
+            status = data[position]
+            if status < 0x80:
+                # Running status: reuse the previous status byte
+                if running_status is None:
+                    raise ValueError("running status without last_status")
+                status = running_status
+            else:
+                position += 1
+                # Meta events don't set running status
+                if status != 0xFF:
+                    running_status = status
+
+            if status == 0xFF:
+                meta_type = data[position]
+                length, position = _read_variable_int(data, position + 1)
+                payload = data[position : position + length]
+                position += length
+                if meta_type in _META_COUNTS:
+                    info[_META_COUNTS[meta_type]] += 1
+                elif meta_type == 0x03:
+                    if midi_type != 0 and track_idx != 0:
+                        name = payload.decode("latin1")
+                elif meta_type == 0x2F:
+                    break
+                continue
+            if status == 0xF0 or status == 0xF7:
+                length, position = _read_variable_int(data, position)
+                position += length
+                continue
+            # Like mido, reject undefined status bytes and data bytes above 127
+            if status >= 0xF0:
+                length = _SYSTEM_DATA_LENGTHS.get(status)
+                if length is None:
+                    raise ValueError(f"undefined status byte 0x{status:02x}")
+                if max(data[position : position + length], default=0) > 0x7F:
+                    raise ValueError("data byte must be in range 0..127")
+                position += length
+                continue
+
+            kind = status & 0xF0
+            length = _CHANNEL_DATA_LENGTHS[kind]
+            # Channel messages carry one or two data bytes, so check the first and last
+            if (data[position] | data[position + length - 1]) > 0x7F:
+                raise ValueError("data byte must be in range 0..127")
+
+            channel = status & 0x0F
+            if kind == 0x90 and data[position + 1] > 0:
+                # Will later be closed by a note off message
+                active_notes[(channel, data[position])].append(
+                    (time, data[position + 1])
+                )
+            elif kind == 0x80 or kind == 0x90:
+                # A note on message with zero velocity also closes a note
+                pitch = data[position]
+                note_ons = active_notes[(channel, pitch)]
+                if note_ons:
+                    onset, velocity = note_ons.pop(0)
+                    notes = get_notes(channel)
+                    notes[0].append(onset)
+                    notes[1].append(time)
+                    notes[2].append(velocity)
+                    notes[3].append(pitch)
+            elif kind == 0xC0:
+                channel_programs[channel] = data[position]
+            elif kind == 0xB0:
+                get_notes(channel)
+            position += length
+
+        # Close all notes still sounding at the end of the track. Like muspy,
+        # every channel seen with a note gets a track under its current program,
+        # even when all of its notes were already closed
+        for (channel, pitch), note_ons in active_notes.items():
+            notes = get_notes(channel)
+            for onset, velocity in note_ons:
+                notes[0].append(onset)
+                notes[1].append(time)
+                notes[2].append(velocity)
+                notes[3].append(pitch)
+
+        for (program, channel), notes in sub_tracks.items():
+            tracks.append({"name": name, "program": program, "is_drum": channel == 9})
+            track_notes.append(notes)
+        position = chunk_end
+
+    counts = [len(notes[0]) for notes in track_notes]
+    offsets = np.zeros(len(counts) + 1, dtype=np.intp)
+    np.cumsum(counts, out=offsets[1:])
+    starts, ends, velocities, pitches = (
+        np.fromiter(
+            (value for notes in track_notes for value in notes[field]),
+            np.int32,
+            count=offsets[-1],
+        )
+        for field in range(4)
+    )
+
+    # Sort each track's notes by start, pitch, duration, then velocity like muspy
+    track_ids = np.repeat(np.arange(len(counts)), counts)
+    order = np.lexsort((velocities, ends - starts, pitches, starts, track_ids))
+
+    for track, lo, hi in zip(tracks, offsets[:-1].tolist(), offsets[1:].tolist()):
+        track["notes"] = slice(lo, hi)
+    return (
+        info,
+        tracks,
+        starts[order],
+        ends[order],
+        velocities[order],
+        pitches[order],
+    )
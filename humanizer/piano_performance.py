@@ -6,233 +6,377 @@ designed for piano music, including chord rolling with normal distribution,
 hand separation, beat accenting, and musical phrasing.
 """
 
-import random
-from collections import defaultdict
-from .presets import get_preset_settings
+import logging
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+from .presets import PresetTicks, get_preset_settings
 from .core import (
+    NoteArrays,
     detect_chords,
     separate_hands_by_pitch,
-    detect_phrase_endings,
-    group_notes_by_timing,
-    resolve_overlapping_notes,
+    phrase_ending_indices,
+    timing_group_ids,
+    random_offsets,
+    _rng,
 )
+from ._fast import HAVE_NUMBA, accent_velocities
 
+logger = logging.getLogger(__name__)
 
-def apply_chord_rolling_normal_dist(
-    chord_notes, mean_timing_ticks, std_timing_ticks, roll_pattern="upward"
-):
-    """
-    Apply rolling effect to a chord using normal distribution for timing variation.
 
-    Args:
-        chord_notes: List of notes in the chord
-        mean_timing_ticks: Mean time delay between notes in ticks
-        std_timing_ticks: Standard deviation for timing variation
-        roll_pattern: "upward", "downward", "inside_out", "outside_in"
+@lru_cache(maxsize=None)
+def _pattern_lut(roll_pattern, size):
     """
-    if len(chord_notes) < 3:
-        return chord_notes
-
-    # Draw from normal distribution for this specific chord's roll intensity
-    actual_roll_timing = random.gauss(mean_timing_ticks, std_timing_ticks)
-    # Clamp to reasonable bounds (prevent negative or extremely long rolls)
-    actual_roll_timing = max(0.2, min(actual_roll_timing, mean_timing_ticks * 6))
-
-    # Sort notes by pitch
-    sorted_notes = sorted(chord_notes, key=lambda n: n.pitch)
-
-    if roll_pattern == "upward":
-        note_order = sorted_notes
-    elif roll_pattern == "downward":
-        note_order = sorted_notes[::-1]
+    Return the order in which pitch-sorted chord notes are played for a roll pattern.
+    Permutations are computed once per (pattern, size) and cached as read-only arrays.
+    """
+    if roll_pattern == "downward":
+        order = list(range(size - 1, -1, -1))
     elif roll_pattern == "inside_out":
         # Start from middle notes and work outward
-        mid = len(sorted_notes) // 2
-        note_order = []
-        for i in range(len(sorted_notes)):
+        mid = size // 2
+        order = []
+        for i in range(size):
             if i % 2 == 0:
                 idx = mid + i // 2
             else:
                 idx = mid - (i + 1) // 2
-            if 0 <= idx < len(sorted_notes):
-                note_order.append(sorted_notes[idx])
+            if 0 <= idx < size:
+                order.append(idx)
     elif roll_pattern == "outside_in":
         # Start from outer notes and work inward
-        note_order = []
-        left, right = 0, len(sorted_notes) - 1
+        order = []
+        left, right = 0, size - 1
         start_left = True
         while left <= right:
             if start_left:
-                note_order.append(sorted_notes[left])
+                order.append(left)
                 left += 1
             else:
-                note_order.append(sorted_notes[right])
+                order.append(right)
                 right -= 1
             start_left = not start_left
-    else:
-        note_order = sorted_notes
+    else:  # upward
+        order = list(range(size))
 
-    # Apply timing offsets with the calculated timing
-    base_time = min(note.start for note in chord_notes)
-    for i, note in enumerate(note_order):
-        note.start = base_time + int(i * actual_roll_timing)
+    order = np.array(order, dtype=np.int32)
+    order.flags.writeable = False
+    return order
 
-    return chord_notes
 
-
-def choose_roll_pattern(chord_notes, settings):
+def roll_chords(
+    arrays,
+    chord_offsets,
+    chord_note_idx,
+    roll_patterns,
+    mean_timing_ticks,
+    std_timing_ticks,
+):
     """
-    Intelligently choose rolling pattern based on chord characteristics.
+    Roll a batch of chords, drawing each chord's roll timing from a normal distribution.
+
+    Args:
+        arrays: NoteArrays holding the track's notes
+        chord_offsets: CSR offsets, chord c holds chord_note_idx[chord_offsets[c]:chord_offsets[c + 1]]
+        chord_note_idx: Note indices of all chords, concatenated
+        roll_patterns: Roll pattern for each chord
+        mean_timing_ticks: Mean time delay between notes in ticks
+        std_timing_ticks: Standard deviation for timing variation (0 for fixed rolls)
     """
-    chord_span = max(note.pitch for note in chord_notes) - min(
-        note.pitch for note in chord_notes
+    chord_starts = chord_offsets[:-1]
+    sizes = np.diff(chord_offsets)
+
+    # Draw every chord's roll intensity at once. A zero spread rolls every chord
+    # at the mean without touching the random stream.
+    if std_timing_ticks == 0:
+        rolls = np.full(len(sizes), float(mean_timing_ticks))
+    else:
+        rolls = _rng.normal(mean_timing_ticks, std_timing_ticks, size=len(sizes))
+    # Clamp to reasonable bounds (prevent negative or extremely long rolls).
+    # The lower bound wins if the two cross, as with max(0.2, min(roll, upper)).
+    np.clip(rolls, 0.2, max(0.2, mean_timing_ticks * 6), out=rolls)
+
+    # Sort notes by pitch within each chord
+    chord_ids = np.repeat(np.arange(len(sizes)), sizes)
+    sorted_idx = chord_note_idx[np.lexsort((arrays.pitches[chord_note_idx], chord_ids))]
+
+    # Reorder each chord's pitch-sorted notes by its roll pattern
+    pattern_idx = np.concatenate(
+        [
+            start + _pattern_lut(roll_pattern, size)
+            for start, size, roll_pattern in zip(
+                chord_starts.tolist(), sizes.tolist(), roll_patterns
+            )
+        ]
     )
+    note_order = sorted_idx[pattern_idx]
 
-    # Jazz style prefers varied patterns
-    if settings.get("jazz_chord_emphasis", False):
-        patterns = ["upward", "downward", "inside_out"]
-        return random.choice(patterns)
+    # Apply timing offsets with the calculated timing, from each chord's earliest note
+    base_times = np.minimum.reduceat(arrays.starts[chord_note_idx], chord_starts)
+    positions = np.arange(len(chord_note_idx)) - np.repeat(chord_starts, sizes)
+    offsets = (positions * np.repeat(rolls, sizes)).astype(np.int32)
+    arrays.move_starts(note_order, np.repeat(base_times, sizes) + offsets)
 
-    # Wide chords often roll upward
-    if chord_span > 24:  # More than 2 octaves
-        return "upward" if random.random() < 0.7 else "downward"
+
+def choose_roll_patterns(chord_spans, settings):
+    """
+    Intelligently choose rolling patterns for chords with the given pitch spans.
+    Returns a list with one roll pattern per chord.
+    """
+    # Jazz style prefers varied patterns
+    if settings.jazz_chord_emphasis:
+        patterns = np.array(["upward", "downward", "inside_out"])
+        return patterns[_rng.integers(len(patterns), size=len(chord_spans))].tolist()
 
     # Narrow chords can use any pattern
-    patterns = ["upward", "downward", "inside_out", "outside_in"]
-    return random.choice(patterns)
+    patterns = np.array(["upward", "downward", "inside_out", "outside_in"])
+    chosen = patterns[_rng.integers(len(patterns), size=len(chord_spans))]
+
+    # Wide chords often roll upward
+    wide = chord_spans > 24  # More than 2 octaves
+    chosen[wide] = np.where(
+        _rng.random(np.count_nonzero(wide)) < 0.7, "upward", "downward"
+    )
+    return chosen.tolist()
 
 
-def calculate_dynamic_roll_probability(base_probability, std_probability=0.02):
+def calculate_dynamic_roll_probability(
+    base_probability, std_probability=0.02, size=None, out=None
+):
     """
     Calculate a varying roll probability using normal distribution.
     This creates sections with more or less rolling tendency.
+    Pass size to draw an array of probabilities at once, or a float64 out
+    array to fill in place.
     """
-    actual_probability = random.gauss(base_probability, std_probability)
-    # Clamp between 0 and reasonable maximum
-    return max(0.0, min(actual_probability, base_probability * 3))
+    upper = max(0.0, base_probability * 3)
+    if out is None:
+        actual_probability = _rng.normal(base_probability, std_probability, size=size)
+        # Clamp between 0 and reasonable maximum
+        return np.clip(actual_probability, 0.0, upper)
+
+    # Same draws as normal(), written straight into the caller's buffer
+    _rng.standard_normal(out=out)
+    out *= std_probability
+    out += base_probability
+    return np.clip(out, 0.0, upper, out=out)
+
+
+# Velocity multiplier indexed by on_beat * 4 + beat number (later beats share slot 3)
+_STRENGTH = np.array(
+    [
+        0.88,  # Off-beat: 12% weaker
+        0.88,
+        0.88,
+        0.88,
+        1.15,  # Downbeat (beat 1): 15% stronger
+        0.95,  # Beats 2, 4: 5% weaker
+        1.08,  # Beat 3 in 4/4: 8% stronger
+        0.95,
+    ]
+)
 
 
-def detect_beat_strength(note, resolution, time_signature=(4, 4)):
+def beat_strengths(starts, resolution, time_signature=(4, 4)):
     """
-    Detect if note is on strong beat, weak beat, or off-beat.
-    Returns strength multiplier for velocity.
+    Detect whether each start time is on a strong beat, weak beat, or off-beat.
+    Returns an array of strength multipliers for velocity.
     """
     beat_ticks = resolution
     beats_per_measure = time_signature[0]
 
-    # Position within the beat (0.0 = exactly on beat, 0.5 = halfway between beats)
-    beat_position = (note.start % beat_ticks) / beat_ticks
-
-    # Which beat in the measure (0, 1, 2, 3 for 4/4)
-    beat_number = (note.start // beat_ticks) % beats_per_measure
+    # Ticks past the beat and which beat in the measure (0, 1, 2, 3 for 4/4)
+    if beats_per_measure == 4 and beat_ticks > 0 and beat_ticks & (beat_ticks - 1) == 0:
+        # Power-of-two resolution in 4/4: shifts and masks replace the divisions
+        beat_offset = starts & (beat_ticks - 1)
+        beat_number = (starts >> (beat_ticks.bit_length() - 1)) & 3
+    else:
+        beat_count, beat_offset = np.divmod(starts, beat_ticks)
+        beat_number = np.minimum(beat_count % beats_per_measure, 3)
 
-    if beat_position < 0.1:  # Very close to a beat (within 10% of beat)
-        if beat_number == 0:  # Downbeat (beat 1)
-            return 1.15  # 15% stronger
-        elif beat_number == 2:  # Beat 3 in 4/4
-            return 1.08  # 8% stronger
-        else:  # Beats 2, 4
-            return 0.95  # 5% weaker
-    else:  # Off-beat
-        return 0.88  # 12% weaker
+    # Very close to a beat (within 10% of beat), compared in integers
+    on_beat = beat_offset * 10 < beat_ticks
+    return _STRENGTH[on_beat * 4 + beat_number]
 
 
-def apply_chord_velocity_correlation(
-    chord_notes, base_velocity_offset, internal_variation=4
-):
+def _accented_velocities(starts, velocities, velocity_range, settings, ticks):
     """
-    Apply correlated velocity changes to a chord.
-    All notes in the chord get similar velocity adjustment with small internal variation.
+    Compute beat-aware, chord-correlated velocities for contiguous note arrays.
+    Returns (velocities, group_ids, group_count, chord_group_count) so callers
+    can report on the timing groups without grouping again.
     """
-    for note in chord_notes:
-        # Each note gets the base offset plus small random variation
-        individual_offset = base_velocity_offset + random.randint(
-            -internal_variation, internal_variation
+    resolution = ticks.resolution
+    beat_accenting = settings.beat_accenting
+    correlate_chords = settings.chord_velocity_correlation
+
+    # Group notes by timing for velocity correlation
+    group_ids, group_count = timing_group_ids(starts, timing_tolerance_ticks=10)
+    group_sizes = np.bincount(group_ids, minlength=group_count)
+
+    # Individual velocity changes (old method), scaled by each note's beat strength
+    individual_offsets = random_offsets(_rng, velocity_range, len(starts))
+    if beat_accenting:
+        note_strengths = beat_strengths(starts, resolution)
+    else:
+        note_strengths = np.ones(len(starts))
+
+    if correlate_chords:
+        # Notes sharing a timing group get the group's base offset, scaled by the
+        # beat strength of its first note, plus a small per-note variation
+        base_offsets = random_offsets(_rng, velocity_range, group_count)
+        if beat_accenting:
+            first_starts = np.full(group_count, np.iinfo(np.int32).max)
+            np.minimum.at(first_starts, group_ids, starts)
+            base_offsets = base_offsets * beat_strengths(first_starts, resolution)
+        group_offsets = base_offsets.astype(np.int32)
+        variations = _rng.integers(-4, 5, size=len(starts))
+    else:
+        group_offsets = variations = np.zeros(0, dtype=np.int32)
+
+    if HAVE_NUMBA:
+        # Pick, scale and clamp every note's offset in one compiled pass
+        new_velocities = velocities.copy()
+        accent_velocities(
+            new_velocities,
+            individual_offsets,
+            note_strengths,
+            group_ids,
+            group_sizes,
+            group_offsets,
+            variations,
+            correlate_chords,
         )
-        note.velocity = max(1, min(127, note.velocity + individual_offset))
+    else:
+        offsets = (individual_offsets * note_strengths).astype(np.int32)
+        if correlate_chords:
+            in_chord = group_sizes[group_ids] > 1
+            offsets = np.where(in_chord, group_offsets[group_ids] + variations, offsets)
+        new_velocities = velocities + offsets
+        np.clip(new_velocities, 1, 127, out=new_velocities)
+
+    chord_group_count = int(np.count_nonzero(group_sizes > 1))
+    return (
+        new_velocities,
+        group_ids,
+        group_count,
+        chord_group_count,
+    )
 
 
-def apply_beat_accenting_and_correlation(notes, settings):
+def apply_beat_accenting_and_correlation(arrays, indices, settings, ticks):
     """
-    Apply beat-aware velocity changes with chord correlation.
+    Apply beat-aware velocity changes with chord correlation
+    to the notes at indices (all notes when None).
+    Returns (group_ids, group_count, chord_group_count) of the timing groups used.
     """
-    resolution = settings["resolution"]
-    velocity_range = settings["velocity_range"]
-
-    # Group notes by timing for velocity correlation
-    note_groups = group_notes_by_timing(notes, timing_tolerance_ticks=10)
-
-    for group_time, group_notes in note_groups.items():
-        # Use the first note to determine beat strength
-        representative_note = group_notes[0]
-
-        # Calculate base velocity offset for this group
-        base_offset = random.randint(-velocity_range, velocity_range)
+    if indices is None:
+        indices = np.arange(len(arrays))
+
+    velocities, group_ids, group_count, chord_group_count = _accented_velocities(
+        arrays.starts[indices],
+        arrays.velocities[indices],
+        settings.velocity_range,
+        settings,
+        ticks,
+    )
+    arrays.velocities[indices] = velocities
+    return group_ids, group_count, chord_group_count
 
-        # Apply beat accenting if enabled
-        if settings.get("beat_accenting", False):
-            beat_multiplier = detect_beat_strength(representative_note, resolution)
-            base_offset = int(base_offset * beat_multiplier)
 
-        # Apply correlated velocity changes to all notes in this timing group
-        if settings.get("chord_velocity_correlation", False) and len(group_notes) > 1:
-            apply_chord_velocity_correlation(group_notes, base_offset)
-        else:
-            # Apply individual velocity changes (old method)
-            for note in group_notes:
-                individual_offset = random.randint(-velocity_range, velocity_range)
-                if settings.get("beat_accenting", False):
-                    beat_multiplier = detect_beat_strength(note, resolution)
-                    individual_offset = int(individual_offset * beat_multiplier)
-                note.velocity = max(1, min(127, note.velocity + individual_offset))
+def _humanize_notes_fused(
+    starts, ends, velocities, settings, ticks, timing_range, velocity_factor
+):
+    """
+    Apply timing variations and beat-aware velocity changes to contiguous
+    note arrays in place, in a single pass over the notes.
+    Returns (group_ids, group_count, chord_group_count) of the timing groups used.
+    """
+    # A zero timing range leaves the notes where they are
+    if timing_range:
+        start_offsets = random_offsets(_rng, timing_range, len(starts))
+        new_starts = np.maximum(0, starts + start_offsets)
+
+        # Moving the start carries the end along
+        ends += new_starts - starts
+        starts[:] = new_starts
+
+    # Velocity changes follow the shifted starts, as beat strength depends on them
+    velocity_range = int(settings.velocity_range * velocity_factor)
+    new_velocities, group_ids, group_count, chord_group_count = _accented_velocities(
+        starts, velocities, velocity_range, settings, ticks
+    )
+    velocities[:] = new_velocities
+    return group_ids, group_count, chord_group_count
 
 
-def humanize_hand(notes, hand_type, settings):
+def humanize_hand(arrays, indices, hand_type, settings, ticks):
     """
     Apply hand-specific humanization.
 
     Args:
-        notes: List of notes for this hand
+        arrays: NoteArrays holding the track's notes
+        indices: Index array of the notes for this hand
         hand_type: "left" or "right"
         settings: Humanization settings
+        ticks: PresetTicks for the file's resolution
+
+    Returns:
+        (group_ids, group_count, chord_group_count) of the hand's timing groups
     """
     if hand_type == "left":
         # Left hand (accompaniment) - more stable, less variation
-        timing_factor = settings.get("left_hand_timing_factor", 0.8)
+        timing_range = ticks.left_hand_timing
         velocity_factor = 0.9
     else:
         # Right hand (melody) - more expressive
-        timing_factor = 1.0
-        velocity_factor = settings.get("right_hand_velocity_factor", 1.1)
-
-    # Apply timing variations
-    timing_range = int(
-        settings["noteon_timing_range"] * settings["resolution"] * timing_factor
+        timing_range = ticks.right_hand_timing
+        velocity_factor = settings.right_hand_velocity_factor
+
+    # Gather the hand's notes once, humanize them contiguously, then scatter back
+    starts = arrays.starts[indices]
+    ends = arrays.ends[indices]
+    velocities = arrays.velocities[indices]
+    grouping = _humanize_notes_fused(
+        starts, ends, velocities, settings, ticks, timing_range, velocity_factor
     )
-    for note in notes:
-        start_offset = random.randint(-timing_range, timing_range)
-        note.start = max(0, note.start + start_offset)
-
-    # Apply velocity variations with beat accenting and correlation
-    hand_settings = settings.copy()
-    hand_settings["velocity_range"] = int(settings["velocity_range"] * velocity_factor)
-    apply_beat_accenting_and_correlation(notes, hand_settings)
+    arrays.starts[indices] = starts
+    arrays.ends[indices] = ends
+    arrays.velocities[indices] = velocities
+    return grouping
 
 
-def apply_phrase_end_ritardando(notes, phrase_endings, settings):
+def apply_phrase_end_ritardando(arrays, phrase_endings, ticks):
     """
     Apply subtle ritardando (slowing) at phrase endings.
+    phrase_endings holds the indices of the phrase-ending notes.
     """
-    resolution = settings["resolution"]
+    window = ticks.resolution * 2  # Within 2 beats
+
+    # Sort once so the notes near every phrase ending can be found by binary search.
+    # Windows are taken from the start times before any delay is applied.
+    starts = arrays.starts.copy()
+    order = np.argsort(starts, kind="stable")
+    sorted_starts = starts[order]
+    phrase_starts = starts[phrase_endings]
+    lows = np.searchsorted(sorted_starts, phrase_starts - window, side="right")
+    highs = np.searchsorted(sorted_starts, phrase_starts + window, side="left")
+
+    # Concatenate every window's slice of the sorted order into one index array
+    window_sizes = np.maximum(highs - lows, 0)
+    window_ends = np.cumsum(window_sizes)
+    positions = np.arange(window_sizes.sum()) + np.repeat(
+        lows - (window_ends - window_sizes), window_sizes
+    )
+    nearby = order[positions]
 
-    for phrase_note in phrase_endings:
-        # Find notes near the phrase ending
-        for note in notes:
-            distance = abs(note.start - phrase_note.start)
-            if distance < resolution * 2:  # Within 2 beats
-                # Apply slight delay for ritardando effect
-                delay = random.randint(5, 25)
-                note.start += delay
+    # Apply slight delay for ritardando effect to notes near the phrase endings.
+    # A note near several endings is delayed once per window, so accumulate.
+    delays = _rng.integers(5, 26, size=len(nearby))
+    np.add.at(arrays.starts, nearby, delays)
+    np.add.at(arrays.ends, nearby, delays)
 
 
 def humanize_midi_advanced(music, method="piano_performance", preset_name="classical"):
@@ -248,28 +392,30 @@ def humanize_midi_advanced(music, method="piano_performance", preset_name="class
         The humanized muspy.Music object
     """
     settings = get_preset_settings(method, preset_name)
-    settings["resolution"] = music.resolution
+
+    # Per-chord details are logged at debug level, replacing the per-track summary
+    log_chords = logger.isEnabledFor(logging.DEBUG)
 
     print(f"Applying {method} humanization with {preset_name} style:")
-    print(f"  Velocity range: ±{settings['velocity_range']}")
-    print(f"  Chord roll base probability: {settings['chord_roll_probability']:.1%}")
-    print(
-        f"  Chord roll timing: μ={settings['chord_roll_mean_timing']:.4f}, σ={settings['chord_roll_std_timing']:.4f} beats"
-    )
-    print(f"  Hand separation: {settings.get('hand_separation_enabled', False)}")
-    print(f"  Beat accenting: {settings.get('beat_accenting', False)}")
+    print(f"  Velocity range: ±{settings.velocity_range}")
+    print(f"  Chord roll base probability: {settings.chord_roll_probability:.1%}")
     print(
-        f"  Chord velocity correlation: {settings.get('chord_velocity_correlation', False)}"
+        f"  Chord roll timing: μ={settings.chord_roll_mean_timing:.4f}, σ={settings.chord_roll_std_timing:.4f} beats"
     )
+    print(f"  Hand separation: {settings.hand_separation_enabled}")
+    print(f"  Beat accenting: {settings.beat_accenting}")
+    print(f"  Chord velocity correlation: {settings.chord_velocity_correlation}")
 
-    # Convert timing ranges to ticks
-    noteon_timing_ticks = int(settings["noteon_timing_range"] * music.resolution)
-    noteoff_timing_ticks = int(settings["noteoff_timing_range"] * music.resolution)
-    min_duration_ticks = int(settings["min_duration_beats"] * music.resolution)
+    # Convert timing ranges and normal distribution parameters to ticks once
+    ticks = PresetTicks.from_settings(settings, music.resolution)
+    roll_probability = settings.chord_roll_probability
+    roll_probability_std = settings.chord_roll_probability_std
 
-    # Convert normal distribution parameters to ticks
-    mean_roll_ticks = settings["chord_roll_mean_timing"] * music.resolution
-    std_roll_ticks = settings["chord_roll_std_timing"] * music.resolution
+    # Scratch buffers for the per-chord float draws, reused across tracks.
+    # A track never has more chords than notes.
+    max_notes = max((len(track.notes) for track in music.tracks), default=0)
+    probability_buffer = np.empty(max_notes)
+    threshold_buffer = np.empty(max_notes)
 
     for track in music.tracks:
         print(f"\nProcessing track: {track.name}")
@@ -278,102 +424,123 @@ def humanize_midi_advanced(music, method="piano_performance", preset_name="class
         if original_count == 0:
             continue
 
-        # Step 1: Detect and apply chord rolling with normal distribution
-        chords = detect_chords(track.notes, tolerance_ticks=5)
-        rolled_chords = 0
-
-        for chord in chords:
-            # Calculate dynamic probability for this chord
-            dynamic_probability = calculate_dynamic_roll_probability(
-                settings["chord_roll_probability"],
-                settings.get("chord_roll_probability_std", 0.02),
-            )
+        arrays = NoteArrays.from_notes(track.notes)
 
-            if random.random() < dynamic_probability:
-                roll_pattern = choose_roll_pattern(chord, settings)
-                apply_chord_rolling_normal_dist(
-                    chord, mean_roll_ticks, std_roll_ticks, roll_pattern
+        # Step 1: Detect and apply chord rolling with normal distribution
+        chord_offsets, chord_note_idx = detect_chords(arrays, tolerance_ticks=5)
+        chord_sizes = np.diff(chord_offsets)
+        chord_count = len(chord_sizes)
+
+        # Calculate dynamic probability for every chord and decide which ones roll
+        dynamic_probabilities = calculate_dynamic_roll_probability(
+            roll_probability,
+            roll_probability_std,
+            out=probability_buffer[:chord_count],
+        )
+        thresholds = _rng.random(out=threshold_buffer[:chord_count])
+        is_rolled = thresholds < dynamic_probabilities
+        rolled_count = int(np.count_nonzero(is_rolled))
+
+        if rolled_count:
+            # Narrow the CSR layout down to the chords that roll
+            rolled_sizes = chord_sizes[is_rolled]
+            rolled_offsets = np.zeros(rolled_count + 1, dtype=np.intp)
+            np.cumsum(rolled_sizes, out=rolled_offsets[1:])
+            rolled_note_idx = chord_note_idx[np.repeat(is_rolled, chord_sizes)]
+
+            rolled_pitches = arrays.pitches[rolled_note_idx]
+            chord_spans = np.maximum.reduceat(
+                rolled_pitches, rolled_offsets[:-1]
+            ) - np.minimum.reduceat(rolled_pitches, rolled_offsets[:-1])
+            roll_patterns = choose_roll_patterns(chord_spans, settings)
+
+            if log_chords:
+                # One record per track, so the handler writes once instead of per chord
+                logger.debug(
+                    "\n".join(
+                        f"    Applied {roll_pattern} roll to {size}-note chord (prob: {dynamic_probability:.1%})"
+                        for size, roll_pattern, dynamic_probability in zip(
+                            rolled_sizes.tolist(),
+                            roll_patterns,
+                            dynamic_probabilities[is_rolled].tolist(),
+                        )
+                    )
                 )
-                rolled_chords += 1
 
-                print(
-                    f"    Applied {roll_pattern} roll to {len(chord)}-note chord (prob: {dynamic_probability:.1%})"
-                )
+            # Roll all chosen chords in one batch
+            roll_chords(
+                arrays,
+                rolled_offsets,
+                rolled_note_idx,
+                roll_patterns,
+                ticks.mean_roll,
+                ticks.std_roll,
+            )
+        else:
+            roll_patterns = []
 
-        print(f"  Rolled {rolled_chords} out of {len(chords)} chords")
+        print(f"  Rolled {rolled_count} out of {chord_count} chords")
+        if roll_patterns and not log_chords:
+            pattern_counts = Counter(roll_patterns)
+            print(
+                "  Roll patterns: "
+                + ", ".join(
+                    f"{pattern} {count}" for pattern, count in pattern_counts.items()
+                )
+            )
 
         # Step 2: Hand separation and specific humanization
-        if settings.get("hand_separation_enabled", False):
-            left_hand, right_hand = separate_hands_by_pitch(track.notes)
+        if settings.hand_separation_enabled:
+            left_hand, right_hand = separate_hands_by_pitch(arrays)
             print(
                 f"  Left hand: {len(left_hand)} notes, Right hand: {len(right_hand)} notes"
             )
 
-            humanize_hand(left_hand, "left", settings)
-            humanize_hand(right_hand, "right", settings)
+            _, _, left_groups = humanize_hand(
+                arrays, left_hand, "left", settings, ticks
+            )
+            _, _, right_groups = humanize_hand(
+                arrays, right_hand, "right", settings, ticks
+            )
 
-            if settings.get("chord_velocity_correlation", False):
-                left_groups = len(
-                    [g for g in group_notes_by_timing(left_hand).values() if len(g) > 1]
-                )
-                right_groups = len(
-                    [
-                        g
-                        for g in group_notes_by_timing(right_hand).values()
-                        if len(g) > 1
-                    ]
-                )
+            if settings.chord_velocity_correlation:
                 print(
                     f"  Applied velocity correlation: {left_groups} left hand, {right_groups} right hand chord groups"
                 )
         else:
             # Apply basic humanization to all notes
-            # First apply timing changes
-            for note in track.notes:
-                start_offset = random.randint(-noteon_timing_ticks, noteon_timing_ticks)
-                note.start = max(0, note.start + start_offset)
-
-                end_offset = random.randint(-noteoff_timing_ticks, noteoff_timing_ticks)
-                note.end = note.end + end_offset
-
-                # Ensure minimum duration
-                if note.end - note.start < min_duration_ticks:
-                    note.end = note.start + min_duration_ticks
+            # First apply timing changes to all notes at once
+            start_offsets = random_offsets(
+                _rng, ticks.noteon_timing, original_count, np.int32
+            )
+            end_offsets = random_offsets(
+                _rng, ticks.noteoff_timing, original_count, np.int32
+            )
+            # Moving the start carries the end along, keeping the minimum duration
+            arrays.shift(start_offsets, end_offsets, ticks.min_duration)
 
             # Then apply velocity changes with correlation and beat accenting
-            apply_beat_accenting_and_correlation(track.notes, settings)
+            _, _, chord_groups = apply_beat_accenting_and_correlation(
+                arrays, None, settings, ticks
+            )
 
-            if settings.get("chord_velocity_correlation", False):
-                note_groups = group_notes_by_timing(track.notes)
-                chord_groups = len([g for g in note_groups.values() if len(g) > 1])
+            if settings.chord_velocity_correlation:
                 print(f"  Applied velocity correlation to {chord_groups} chord groups")
 
         # Step 3: Apply phrase-end ritardando
-        phrase_endings = detect_phrase_endings(track.notes)
-        if phrase_endings:
-            apply_phrase_end_ritardando(track.notes, phrase_endings, settings)
+        phrase_endings = phrase_ending_indices(arrays.starts, arrays.ends)
+        if len(phrase_endings):
+            apply_phrase_end_ritardando(arrays, phrase_endings, ticks)
             print(f"  Applied ritardando to {len(phrase_endings)} phrase endings")
 
         # Step 4: Resolve overlapping notes
-        overlap_count = 0
-        notes_by_pitch = defaultdict(list)
-        for note in track.notes:
-            notes_by_pitch[note.pitch].append(note)
-
-        for pitch, notes in notes_by_pitch.items():
-            notes.sort(key=lambda n: n.start)
-            for i in range(len(notes) - 1):
-                current_note = notes[i]
-                next_note = notes[i + 1]
-                if current_note.end > next_note.start:
-                    overlap_count += 1
-                    current_note.end = max(
-                        current_note.start + min_duration_ticks, next_note.start - 1
-                    )
-
+        overlap_count = arrays.shorten_overlaps(ticks.min_duration)
         if overlap_count > 0:
             print(f"  Resolved {overlap_count} overlapping notes")
 
+        # Write the humanized values back onto the track's notes once
+        arrays.sync_back()
+
         print(f"  Processed {original_count} notes")
 
     return music
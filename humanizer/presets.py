@@ -5,6 +5,67 @@ This module contains all the preset definitions for different humanization
 methods with normal distribution parameters for more realistic chord rolling.
 """
 
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+@dataclass(frozen=True, slots=True)
+class PresetSettings:
+    """
+    Immutable settings for one humanization preset.
+    Keys a preset leaves out take the defaults below.
+    """
+
+    velocity_range: int
+    noteon_timing_range: float
+    noteoff_timing_range: float
+    min_duration_beats: float
+    chord_roll_probability: float
+    description: str = ""
+    chord_roll_timing: float = 0.0
+    chord_roll_probability_std: float = 0.02
+    chord_roll_mean_timing: float = 0.0
+    chord_roll_std_timing: float = 0.0
+    hand_separation_enabled: bool = False
+    left_hand_timing_factor: float = 0.8
+    right_hand_velocity_factor: float = 1.1
+    jazz_chord_emphasis: bool = False
+    beat_accenting: bool = False
+    chord_velocity_correlation: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class PresetTicks:
+    """
+    A preset's beat-based ranges converted to ticks at one file's resolution.
+    Computed once per run and passed to the humanization helpers.
+    """
+
+    resolution: int
+    noteon_timing: int
+    noteoff_timing: int
+    min_duration: int
+    mean_roll: float
+    std_roll: float
+    left_hand_timing: int
+    right_hand_timing: int
+
+    @classmethod
+    def from_settings(cls, settings, resolution):
+        """Convert the ranges of a PresetSettings at the given resolution."""
+        noteon_timing = settings.noteon_timing_range * resolution
+        return cls(
+            resolution=resolution,
+            noteon_timing=int(noteon_timing),
+            noteoff_timing=int(settings.noteoff_timing_range * resolution),
+            min_duration=int(settings.min_duration_beats * resolution),
+            mean_roll=settings.chord_roll_mean_timing * resolution,
+            std_roll=settings.chord_roll_std_timing * resolution,
+            left_hand_timing=int(noteon_timing * settings.left_hand_timing_factor),
+            right_hand_timing=int(noteon_timing),
+        )
+
+
 # Enhanced humanization methods with normal distribution chord rolling
 HUMANIZATION_METHODS = {
     "basic": {
@@ -97,16 +158,32 @@ HUMANIZATION_METHODS = {
     },
 }
 
+# Settings objects for every preset, built once at import time
+_PRESET_SETTINGS = {
+    method: {
+        preset_name: PresetSettings(**preset)
+        for preset_name, preset in method_data["presets"].items()
+    }
+    for method, method_data in HUMANIZATION_METHODS.items()
+}
+
 
+@lru_cache(maxsize=64)
 def get_preset_settings(method, preset_name):
-    """Get settings for a humanization method and preset"""
-    if method not in HUMANIZATION_METHODS:
+    """
+    Get the PresetSettings for a humanization method and preset.
+    Results are cached and shared between callers, which is safe because
+    PresetSettings is frozen.
+    """
+    method_settings = _PRESET_SETTINGS.get(method)
+    if method_settings is None:
         raise ValueError(f"Unknown method: {method}")
 
-    if preset_name not in HUMANIZATION_METHODS[method]["presets"]:
-        available_presets = list(HUMANIZATION_METHODS[method]["presets"].keys())
+    settings = method_settings.get(preset_name)
+    if settings is None:
+        available_presets = list(method_settings.keys())
         raise ValueError(
             f"Unknown preset '{preset_name}' for method '{method}'. Available: {available_presets}"
         )
 
-    return HUMANIZATION_METHODS[method]["presets"][preset_name]
+    return settings
@@ -7,14 +7,11 @@ sound more natural and less mechanical. It supports multiple methods and
 intensity presets.
 """
 
-import warnings
-
-# Suppress the pkg_resources deprecation warning from pretty_midi/muspy
-warnings.filterwarnings("ignore", message="pkg_resources is deprecated as an API")
-
 import argparse
-import muspy
+import logging
 import os
+import sys
+import warnings
 
 # Import humanization modules
 from humanizer import (
@@ -22,6 +19,7 @@ from humanizer import (
     get_preset_settings,
     humanize_midi_basic,
     humanize_midi_advanced,
+    seed_humanizer,
 )
 
 
@@ -71,6 +69,21 @@ def main():
         help="Override chord roll probability (0.0-1.0, piano_performance method only)",
     )
 
+    # Performance
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of worker processes for per-track humanization (basic method only)",
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Seed the random generator for reproducible output",
+    )
+
     # Debugging
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Enable verbose output"
@@ -78,6 +91,11 @@ def main():
 
     args = parser.parse_args()
 
+    # Verbose mode turns on the humanizer's debug logging, printed like its other output
+    if args.verbose:
+        logging.basicConfig(format="%(message)s", stream=sys.stdout)
+        logging.getLogger("humanizer").setLevel(logging.DEBUG)
+
     # Handle list-presets command
     if args.list_presets:
         print("Available humanization methods and presets:")
@@ -121,6 +139,11 @@ def main():
         print(f"Error: {e}")
         return
 
+    # muspy takes over a second to import, so only load it once there is a file
+    # to process. Suppress the pkg_resources deprecation warning from pretty_midi/muspy.
+    warnings.filterwarnings("ignore", message="pkg_resources is deprecated as an API")
+    import muspy
+
     print(f"Loading MIDI file: {args.input_file}")
     try:
         music = muspy.read_midi(args.input_file)
@@ -139,6 +162,9 @@ def main():
         print(f"Error loading MIDI file: {e}")
         return
 
+    if args.seed is not None:
+        seed_humanizer(args.seed)
+
     print(f"\nHumanizing with method '{method}' and preset '{preset}'...")
 
     try:
@@ -146,7 +172,9 @@ def main():
         if method == "piano_performance":
             humanized_music = humanize_midi_advanced(music, method, preset)
         else:  # basic and any future simple methods
-            humanized_music = humanize_midi_basic(music, method, preset)
+            humanized_music = humanize_midi_basic(
+                music, method, preset, workers=args.jobs
+            )
 
         print(f"\nSaving humanized MIDI file: {args.output_file}")
         muspy.write_midi(args.output_file, humanized_music)
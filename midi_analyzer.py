@@ -1,76 +1,141 @@
-import muspy
+import argparse
 import sys
 
+import numpy as np
 
-def analyze_muspy(file_path):
-    """Analyze MIDI file using muspy"""
+from humanizer.fast_io import read_notes_fast
+
+# Note name with octave for every MIDI pitch, e.g. PITCH_NAMES[60] == "C4"
+NOTE_NAMES = ("C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B")
+PITCH_NAMES = tuple(
+    NOTE_NAMES[pitch % 12] + str(pitch // 12 - 1) for pitch in range(128)
+)
+
+
+def read_notes_muspy(file_path):
+    """Read the notes of a MIDI file with muspy, in the read_notes_fast layout"""
+    # muspy is slow to import, so only load it when this path is used
+    import muspy
+
+    music = muspy.read_midi(file_path)
+
+    info = {
+        "resolution": music.resolution,
+        "tempos": len(music.tempos),
+        "key_signatures": len(music.key_signatures),
+        "time_signatures": len(music.time_signatures),
+    }
+    tracks = []
+    offset = 0
+    for track in music.tracks:
+        tracks.append(
+            {
+                "name": track.name,
+                "program": track.program,
+                "is_drum": track.is_drum,
+                "notes": slice(offset, offset + len(track.notes)),
+            }
+        )
+        offset += len(track.notes)
+
+    # Same layout as notes_to_soa, built here to keep the analyzer free of the
+    # humanizers' numba imports
+    notes = [note for track in music.tracks for note in track.notes]
+    return (
+        info,
+        tracks,
+        *(
+            np.fromiter((getattr(note, field) for note in notes), np.int32, len(notes))
+            for field in ("start", "end", "velocity", "pitch")
+        ),
+    )
+
+
+def note_rows(starts, ends, velocities, pitches, indices):
+    """Return (start, end, pitch, velocity) tuples for the notes at indices"""
+    return zip(
+        starts[indices].tolist(),
+        ends[indices].tolist(),
+        pitches[indices].tolist(),
+        velocities[indices].tolist(),
+    )
+
+
+def analyze_midi(file_path, compat=False):
+    """Analyze the notes of a MIDI file"""
     try:
         # Load the MIDI file
-        music = muspy.read_midi(file_path)
+        read_notes = read_notes_muspy if compat else read_notes_fast
+        info, tracks, starts, ends, velocities, pitches = read_notes(file_path)
 
         print(f"File: {file_path}")
-        print(f"Resolution: {music.resolution} ticks per beat")
-        print(f"Tempos: {len(music.tempos)}")
-        print(f"Key signatures: {len(music.key_signatures)}")
-        print(f"Time signatures: {len(music.time_signatures)}")
-        print(f"Tracks: {len(music.tracks)}")
+        print(f"Resolution: {info['resolution']} ticks per beat")
+        print(f"Tempos: {info['tempos']}")
+        print(f"Key signatures: {info['key_signatures']}")
+        print(f"Time signatures: {info['time_signatures']}")
+        print(f"Tracks: {len(tracks)}")
         print()
 
         # Show notes from each track
-        for i, track in enumerate(music.tracks):
-            print(f"Track {i}: {track.name if track.name else 'Unnamed'}")
-            print(f"  Program: {track.program}, Is drum: {track.is_drum}")
-            print(f"  Notes: {len(track.notes)}")
+        for i, track in enumerate(tracks):
+            notes = track["notes"]
+            note_count = notes.stop - notes.start
 
-            if track.notes:
+            print(f"Track {i}: {track['name'] if track['name'] else 'Unnamed'}")
+            print(f"  Program: {track['program']}, Is drum: {track['is_drum']}")
+            print(f"  Notes: {note_count}")
+
+            if note_count:
                 print("  Note details:")
                 print("    #   Start     End       Duration  Pitch  Vel  Note")
                 print("    " + "-" * 55)
 
-                for j, note in enumerate(track.notes[:20]):  # Show first 20 notes
-                    duration = note.end - note.start
-                    # Simple note name conversion
-                    note_names = [
-                        "C",
-                        "C#",
-                        "D",
-                        "D#",
-                        "E",
-                        "F",
-                        "F#",
-                        "G",
-                        "G#",
-                        "A",
-                        "A#",
-                        "B",
-                    ]
-                    octave = (note.pitch // 12) - 1
-                    note_name = note_names[note.pitch % 12] + str(octave)
+                # Show first 20 notes
+                preview = slice(notes.start, min(notes.stop, notes.start + 20))
+                for j, (start, end, pitch, velocity) in enumerate(
+                    note_rows(starts, ends, velocities, pitches, preview)
+                ):
+                    duration = end - start
+                    note_name = PITCH_NAMES[pitch]
                     print(
-                        f"    {j:2d}  {note.start:8d}  {note.end:8d}  {duration:8d}  {note.pitch:3d}  {note.velocity:3d}  {note_name}"
+                        f"    {j:2d}  {start:8d}  {end:8d}  {duration:8d}  {pitch:3d}  {velocity:3d}  {note_name}"
                     )
 
-                if len(track.notes) > 20:
-                    print(f"    ... and {len(track.notes) - 20} more notes")
+                if note_count > 20:
+                    print(f"    ... and {note_count - 20} more notes")
 
-                # Look for E4 notes specifically
-                e4_notes = [n for n in track.notes if n.pitch == 64]
+                # Look for E4 notes specifically, in one vectorized scan of the
+                # track's pitches rather than a Python pass over every note
+                e4_notes = notes.start + np.flatnonzero(pitches[notes] == 64)
                 print(f"\n  E4 notes in this track: {len(e4_notes)}")
-                for j, note in enumerate(e4_notes):
-                    duration = note.end - note.start
-                    print(
-                        f"    E4 #{j+1}: start {note.start:8d}, end {note.end:8d}, duration {duration:8d}, vel {note.velocity}"
+                # Tracks can hold thousands of E4 notes, so write them in one call
+                sys.stdout.write(
+                    "".join(
+                        f"    E4 #{j+1}: start {start:8d}, end {end:8d}, duration {end - start:8d}, vel {velocity}\n"
+                        for j, (start, end, _, velocity) in enumerate(
+                            note_rows(starts, ends, velocities, pitches, e4_notes)
+                        )
                     )
+                )
 
             print()
 
     except Exception as e:
-        print(f"Error reading MIDI file with muspy: {e}")
+        print(f"Error reading MIDI file: {e}")
 
 
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python muspy_analyzer.py <midi_file>")
-        sys.exit(1)
+def main():
+    parser = argparse.ArgumentParser(description="Show the notes of a MIDI file")
+    parser.add_argument("midi_file", help="MIDI file to analyze")
+    parser.add_argument(
+        "--compat",
+        action="store_true",
+        help="Read the file through muspy instead of the fast note reader",
+    )
+    args = parser.parse_args()
+
+    analyze_midi(args.midi_file, compat=args.compat)
 
-    analyze_muspy(sys.argv[1])
+
+if __name__ == "__main__":
+    main()
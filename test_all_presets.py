@@ -5,46 +5,38 @@ This script takes an input MIDI file and creates output files for every combinat
 of humanization method and preset.
 """
 
+import warnings
+
+# Suppress the pkg_resources deprecation warning from pretty_midi/muspy
+warnings.filterwarnings("ignore", message="pkg_resources is deprecated as an API")
+
 import argparse
+import copy
+import io
 import os
-import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, redirect_stdout
+from itertools import repeat
 from pathlib import Path
 
+import muspy
+
+from humanizer import (
+    HUMANIZATION_METHODS,
+    humanize_midi_advanced,
+    humanize_midi_basic,
+    seed_humanizer,
+)
+from humanizer.core import _rng
 
-def get_available_options():
-    """Get all available methods and presets by running the humanizer with --list-presets"""
-    try:
-        result = subprocess.run(
-            [sys.executable, "humanizer_cli.py", "--list-presets"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-
-        methods = {}
-        current_method = None
 
-        for line in result.stdout.split("\n"):
-            line = line.strip()
-            if line.startswith("Method: "):
-                current_method = line.replace("Method: ", "")
-                methods[current_method] = []
-            elif (
-                line
-                and current_method
-                and ":" in line
-                and not line.startswith("Description")
-                and not line.startswith("Presets:")
-            ):
-                preset_name = line.split(":")[0].strip()
-                if preset_name:  # Make sure it's not empty
-                    methods[current_method].append(preset_name)
-
-        return methods
-    except subprocess.CalledProcessError as e:
-        print(f"Error getting available options: {e}")
-        return {}
+def get_available_options():
+    """Get all available methods and presets from the humanizer's preset table"""
+    return {
+        method: list(method_data["presets"])
+        for method, method_data in HUMANIZATION_METHODS.items()
+    }
 
 
 def create_output_filename(input_file, method, preset, output_dir):
@@ -57,24 +49,34 @@ def create_output_filename(input_file, method, preset, output_dir):
     return os.path.join(output_dir, output_filename)
 
 
-def run_humanization(input_file, output_file, method, preset):
-    """Run the humanizer with specified method and preset"""
-    cmd = [
-        sys.executable,
-        "humanizer_cli.py",
-        input_file,
-        output_file,
-        "--method",
-        method,
-        "--preset",
-        preset,
-    ]
-
+def run_humanization(
+    music, output_file, method, preset, seed=None, capture_output=False
+):
+    """
+    Humanize a copy of the loaded music with specified method and preset,
+    seeding the humanizer with seed first. The humanizer's output is returned
+    when capture_output is set and discarded otherwise.
+    """
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return True, result.stdout
-    except subprocess.CalledProcessError as e:
-        return False, e.stderr
+        with ExitStack() as stack:
+            if capture_output:
+                output = stack.enter_context(io.StringIO())
+            else:
+                output = stack.enter_context(open(os.devnull, "w"))
+            stack.enter_context(redirect_stdout(output))
+
+            # Humanizers modify the music in place, so keep the original intact
+            humanized = copy.deepcopy(music)
+            seed_humanizer(seed)
+            if method == "piano_performance":
+                humanized = humanize_midi_advanced(humanized, method, preset)
+            else:
+                humanized = humanize_midi_basic(humanized, method, preset)
+            muspy.write_midi(output_file, humanized)
+
+            return True, output.getvalue() if capture_output else ""
+    except Exception as e:
+        return False, str(e)
 
 
 def main():
@@ -98,6 +100,13 @@ def main():
         action="store_true",
         help="Show detailed output from each humanization",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of worker processes to humanize presets in (default: 1)",
+    )
 
     args = parser.parse_args()
 
@@ -106,6 +115,13 @@ def main():
         print(f"Error: Input file '{args.input_file}' not found")
         return 1
 
+    # Load the input once and humanize copies of it for every combination
+    try:
+        music = muspy.read_midi(args.input_file)
+    except Exception as e:
+        print(f"Error loading MIDI file: {e}")
+        return 1
+
     # Create output directory
     os.makedirs(args.output_dir, exist_ok=True)
     print(f"Output directory: {args.output_dir}")
@@ -146,18 +162,46 @@ def main():
     successful = 0
     failed = 0
 
-    for method, presets in methods.items():
-        print(f"Method: {method}")
+    combinations = [
+        (method, preset) for method, presets in methods.items() for preset in presets
+    ]
+    output_files = [
+        create_output_filename(args.input_file, method, preset, args.output_dir)
+        for method, preset in combinations
+    ]
+    # Forked workers inherit the same generator state, so draw each combination
+    # its own seed here to keep runs independent and --jobs output unchanged
+    seeds = _rng.integers(2**63, size=len(combinations)).tolist()
+    task_args = (
+        repeat(music),
+        output_files,
+        [method for method, _ in combinations],
+        [preset for _, preset in combinations],
+        seeds,
+        # Only verbose runs show the humanizer's output
+        repeat(args.verbose),
+    )
 
-        for preset in presets:
-            output_file = create_output_filename(
-                args.input_file, method, preset, args.output_dir
-            )
-            print(f"  Preset: {preset} -> {os.path.basename(output_file)}")
+    with ExitStack() as stack:
+        # Combinations are independent, so workers can humanize them concurrently.
+        # Results still arrive in order, so the report reads the same either way.
+        if args.jobs > 1:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=args.jobs))
+            results = executor.map(run_humanization, *task_args)
+        else:
+            results = map(run_humanization, *task_args)
 
-            success, output = run_humanization(
-                args.input_file, output_file, method, preset
-            )
+        current_method = None
+        for (method, preset), output_file, (success, output) in zip(
+            combinations, output_files, results
+        ):
+            if method != current_method:
+                if current_method is not None:
+                    print()
+                print(f"Method: {method}")
+                current_method = method
+
+            print(f"  Preset: {preset} -> {os.path.basename(output_file)}")
 
             if success:
                 successful += 1
@@ -177,7 +221,7 @@ def main():
                 failed += 1
                 print(f"    ✗ Failed: {output}")
 
-        print()
+    print()
 
     # Summary
     print("=" * 50)
@@ -190,11 +234,13 @@ def main():
 
     if successful > 0:
         print(f"\nGenerated files:")
-        for file in sorted(os.listdir(args.output_dir)):
-            if file.endswith(".mid"):
-                file_path = os.path.join(args.output_dir, file)
-                size = os.path.getsize(file_path)
-                print(f"  {file} ({size:,} bytes)")
+        with os.scandir(args.output_dir) as entries:
+            midi_files = sorted(
+                (entry for entry in entries if entry.name.endswith(".mid")),
+                key=lambda entry: entry.name,
+            )
+        for entry in midi_files:
+            print(f"  {entry.name} ({entry.stat().st_size:,} bytes)")
 
     return 0 if failed == 0 else 1
 